@@ -0,0 +1,143 @@
+from collections import defaultdict
+from decimal import Decimal
+from statistics import quantiles
+from time import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, F
+
+from kitchen.models import Dish, DishType, DishTypePriceStats, CookWorkloadStats
+
+ANALYTICS_CACHE_KEY = "kitchen:analytics"
+CENTS = Decimal("0.01")
+
+PRICE_FIELDS = [
+    "dish_count",
+    "min_price",
+    "max_price",
+    "avg_price",
+    "p25_price",
+    "median_price",
+    "p75_price",
+    "p90_price",
+    "updated_at",
+]
+
+WORKLOAD_FIELDS = [
+    "cook_count",
+    "dish_count",
+    "min_dishes",
+    "max_dishes",
+    "avg_dishes",
+    "updated_at",
+]
+
+
+def price_stats(prices):
+    if not prices:
+        return {"dish_count": 0}
+
+    prices = sorted(prices)
+    # 99 cut points in one pass, percentile p is cut point p - 1
+    cuts = quantiles(prices, n=100, method="inclusive") if len(prices) > 1 else prices * 99
+    return {
+        "dish_count": len(prices),
+        "min_price": prices[0],
+        "max_price": prices[-1],
+        "avg_price": (sum(prices) / len(prices)).quantize(CENTS),
+        "p25_price": cuts[24].quantize(CENTS),
+        "median_price": cuts[49].quantize(CENTS),
+        "p75_price": cuts[74].quantize(CENTS),
+        "p90_price": cuts[89].quantize(CENTS),
+    }
+
+
+def refresh_price_stats(dish_type_ids=None):
+    """Recompute price stats of the given dish types, or of all of them."""
+    dish_types = DishType.objects.all()
+    dishes = Dish.objects.all()
+    if dish_type_ids is not None:
+        dish_types = dish_types.filter(id__in=dish_type_ids)
+        dishes = dishes.filter(dish_type_id__in=dish_type_ids)
+
+    prices = defaultdict(list)
+    for dish_type_id, price in dishes.order_by().values_list("dish_type_id", "price"):
+        prices[dish_type_id].append(price)
+
+    DishTypePriceStats.objects.bulk_create(
+        [
+            DishTypePriceStats(dish_type_id=dish_type_id, **price_stats(prices[dish_type_id]))
+            for dish_type_id in dish_types.values_list("id", flat=True)
+        ],
+        update_conflicts=True,
+        unique_fields=["dish_type"],
+        update_fields=PRICE_FIELDS,
+    )
+    cache.delete(ANALYTICS_CACHE_KEY)
+
+
+def refresh_cook_workload(years=None):
+    """Recompute workload of cooks with the given years of experience, or of all cooks."""
+    cooks = get_user_model().objects.all()
+    stale = CookWorkloadStats.objects.all()
+    if years is not None:
+        cooks = cooks.filter(years_of_experience__in=years)
+        stale = stale.filter(years_of_experience__in=years)
+
+    buckets = defaultdict(list)
+    for years_of_experience, num_dishes in (
+        cooks.annotate(num_dishes=Count("dishes"))
+        .order_by()
+        .values_list("years_of_experience", "num_dishes")
+    ):
+        buckets[years_of_experience].append(num_dishes)
+
+    CookWorkloadStats.objects.bulk_create(
+        [
+            CookWorkloadStats(
+                years_of_experience=years_of_experience,
+                cook_count=len(counts),
+                dish_count=sum(counts),
+                min_dishes=min(counts),
+                max_dishes=max(counts),
+                avg_dishes=(Decimal(sum(counts)) / len(counts)).quantize(CENTS),
+            )
+            for years_of_experience, counts in buckets.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["years_of_experience"],
+        update_fields=WORKLOAD_FIELDS,
+    )
+    stale.exclude(years_of_experience__in=buckets).delete()
+    cache.delete(ANALYTICS_CACHE_KEY)
+
+
+def get_analytics():
+    analytics = cache.get(ANALYTICS_CACHE_KEY)
+    if analytics is None:
+        analytics = {
+            "dish_types": list(
+                DishTypePriceStats.objects.values(*PRICE_FIELDS, name=F("dish_type__name"))
+            ),
+            "cook_workload": list(
+                CookWorkloadStats.objects.values("years_of_experience", *WORKLOAD_FIELDS)
+            ),
+        }
+        cache.set(ANALYTICS_CACHE_KEY, analytics, settings.ANALYTICS_CACHE_TIMEOUT)
+    return analytics
+
+
+def is_rate_limited(user):
+    # One counter per user and minute, so the window resets whatever
+    # timeout the cache backend keeps on incr()
+    key = f"{ANALYTICS_CACHE_KEY}:requests:{user.pk}:{int(time() // 60)}"
+    if cache.add(key, 1, 60):
+        return False
+    try:
+        return cache.incr(key) > settings.ANALYTICS_RATE_LIMIT
+    except ValueError:
+        # The counter expired between add() and incr()
+        cache.set(key, 1, 60)
+        return False
@@ -0,0 +1,95 @@
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import router, transaction
+from django.db.models.signals import m2m_changed
+
+from kitchen.models import Dish
+from kitchen.signals import dish_cooks_bulk_changed
+
+BATCH_SIZE = 500
+
+
+def _check_ids(model, ids):
+    missing = set(ids) - set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+    if missing:
+        raise ValueError(
+            f"Unknown {model._meta.verbose_name} ids: {', '.join(map(str, sorted(missing)))}"
+        )
+
+
+def _send_m2m_changed(action, dishes, pairs):
+    cooks_by_dish = defaultdict(set)
+    for cook_id, dish_id in pairs:
+        cooks_by_dish[dish_id].add(cook_id)
+    for dish_id, cook_ids in cooks_by_dish.items():
+        m2m_changed.send(
+            sender=Dish.cooks.through,
+            instance=dishes[dish_id],
+            action=action,
+            reverse=False,
+            model=get_user_model(),
+            pk_set=cook_ids,
+            using=router.db_for_write(Dish.cooks.through),
+            bulk_assign=True,
+        )
+
+
+def bulk_assign(pairs, dish_ids=None, batch_size=BATCH_SIZE):
+    """
+    Make the (cook_id, dish_id) pairs the only cook assignments of their
+    dishes, and of ``dish_ids`` when given (an empty target clears them).
+    Each batch of dishes is read, inserted into and deleted from with one
+    query each. The diff is a set difference in Python over the rows of
+    that one read. Every batch sends m2m_changed pre/post_add and
+    pre/post_remove once per changed dish with ``bulk_assign=True``, and
+    dish_cooks_bulk_changed is sent once with all the changes.
+    Returns the number of added and removed assignments.
+    """
+    target = defaultdict(set)
+    for cook_id, dish_id in pairs:
+        target[int(dish_id)].add(int(cook_id))
+    scope = sorted(set(target) | {int(dish_id) for dish_id in dish_ids or ()})
+
+    _check_ids(Dish, scope)
+    _check_ids(get_user_model(), set().union(*target.values()))
+
+    through = Dish.cooks.through
+    added, removed = set(), set()
+    with transaction.atomic():
+        for start in range(0, len(scope), batch_size):
+            batch = scope[start:start + batch_size]
+            existing = {
+                (cook_id, dish_id): pk
+                for pk, cook_id, dish_id in through.objects.filter(
+                    dish_id__in=batch
+                ).values_list("pk", "cook_id", "dish_id")
+            }
+            wanted = {
+                (cook_id, dish_id)
+                for dish_id in batch
+                for cook_id in target[dish_id]
+            }
+            to_add = wanted - existing.keys()
+            to_remove = existing.keys() - wanted
+            if not to_add and not to_remove:
+                continue
+
+            dishes = Dish.objects.in_bulk({dish_id for _, dish_id in to_add | to_remove})
+            if to_add:
+                _send_m2m_changed("pre_add", dishes, to_add)
+                through.objects.bulk_create(
+                    [through(cook_id=cook_id, dish_id=dish_id) for cook_id, dish_id in to_add],
+                    ignore_conflicts=True,
+                )
+                _send_m2m_changed("post_add", dishes, to_add)
+            if to_remove:
+                _send_m2m_changed("pre_remove", dishes, to_remove)
+                through.objects.filter(pk__in=[existing[pair] for pair in to_remove]).delete()
+                _send_m2m_changed("post_remove", dishes, to_remove)
+            added |= to_add
+            removed |= to_remove
+
+        if added or removed:
+            dish_cooks_bulk_changed.send(sender=through, added=added, removed=removed)
+    return {"added": len(added), "removed": len(removed)}
@@ -0,0 +1,52 @@
+import csv
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from kitchen.assignments import BATCH_SIZE, bulk_assign
+
+
+class Command(BaseCommand):
+    help = (
+        "Replace the cooks of the listed dishes with the cook_id,dish_id pairs "
+        "of a CSV file"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("file", help='CSV file of cook_id,dish_id rows, "-" for stdin')
+        parser.add_argument(
+            "--dish",
+            type=int,
+            action="append",
+            dest="dishes",
+            help="Also clear cooks of this dish id when it has no rows, repeatable",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options["file"] == "-":
+            pairs = self.read_pairs(sys.stdin)
+        else:
+            try:
+                with open(options["file"], newline="") as file:
+                    pairs = self.read_pairs(file)
+            except OSError as error:
+                raise CommandError(f"Cannot read {options['file']}: {error.strerror}")
+
+        try:
+            result = bulk_assign(pairs, options["dishes"], options["batch_size"])
+        except ValueError as error:
+            raise CommandError(error)
+        self.stdout.write(self.style.SUCCESS(
+            f"Added {result['added']} and removed {result['removed']} assignments"
+        ))
+
+    def read_pairs(self, file):
+        pairs = []
+        for line, row in enumerate(csv.reader(file), start=1):
+            if not row or row[0].strip().lower() == "cook_id":
+                continue
+            if len(row) != 2:
+                raise CommandError(f"Line {line}: expected cook_id,dish_id")
+            pairs.append(row)
+        return pairs
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from kitchen.analytics import refresh_cook_workload, refresh_price_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the menu price and cook workload summary tables"
+
+    def handle(self, *args, **options):
+        refresh_price_stats()
+        refresh_cook_workload()
+        self.stdout.write(self.style.SUCCESS("Analytics refreshed"))
@@ -0,0 +1,71 @@
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from kitchen.warmup import warmup
+
+IMPORT_SCRIPT = (
+    "from django.core.wsgi import get_wsgi_application; "
+    "application = get_wsgi_application(); "
+    "from kitchen.warmup import warmup; warmup()"
+)
+
+
+class Command(BaseCommand):
+    help = "Compile project templates and resolve URL patterns, optionally report import times"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--import-profile",
+            action="store_true",
+            help="Report the slowest imports of a fresh worker boot (python -X importtime)",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=20,
+            help="Number of modules shown in the import profile",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = warmup()
+        elapsed = (time.perf_counter() - started) * 1000
+
+        for name, error in result["template_errors"].items():
+            self.stderr.write(f"Template {name} failed to compile: {error}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Compiled {result['templates']} templates and resolved "
+            f"{result['urls']} URL patterns in {elapsed:.1f} ms"
+        ))
+
+        if options["import_profile"]:
+            self.import_profile(options["top"])
+
+    def import_profile(self, top):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+        )
+        if process.returncode:
+            self.stderr.write(process.stderr)
+            return
+
+        # Lines look like "import time:   self [us] | cumulative | imported package"
+        timings = []
+        for line in process.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            own, cumulative, module = line[len("import time:"):].split("|")
+            timings.append((int(own), int(cumulative), module.strip()))
+
+        total = sum(own for own, _, _ in timings) / 1000
+        self.stdout.write(f"{len(timings)} modules imported in {total:.1f} ms, slowest:")
+        self.stdout.write(f"{'self ms':>9} {'cumulative ms':>14}  module")
+        for own, cumulative, module in sorted(timings, reverse=True)[:top]:
+            self.stdout.write(f"{own / 1000:>9.1f} {cumulative / 1000:>14.1f}  {module}")
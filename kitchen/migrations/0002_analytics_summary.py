@@ -0,0 +1,51 @@
+# Generated by Django 5.0.2 on 2026-10-18 23:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kitchen', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CookWorkloadStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('years_of_experience', models.PositiveSmallIntegerField(unique=True)),
+                ('cook_count', models.PositiveIntegerField(default=0)),
+                ('dish_count', models.PositiveIntegerField(default=0)),
+                ('min_dishes', models.PositiveIntegerField(default=0)),
+                ('max_dishes', models.PositiveIntegerField(default=0)),
+                ('avg_dishes', models.DecimalField(decimal_places=2, default=0, max_digits=7)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'cook workload stats',
+                'ordering': ('years_of_experience',),
+            },
+        ),
+        migrations.CreateModel(
+            name='DishTypePriceStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dish_count', models.PositiveIntegerField(default=0)),
+                ('min_price', models.DecimalField(decimal_places=2, max_digits=7, null=True)),
+                ('max_price', models.DecimalField(decimal_places=2, max_digits=7, null=True)),
+                ('avg_price', models.DecimalField(decimal_places=2, max_digits=7, null=True)),
+                ('p25_price', models.DecimalField(decimal_places=2, max_digits=7, null=True)),
+                ('median_price', models.DecimalField(decimal_places=2, max_digits=7, null=True)),
+                ('p75_price', models.DecimalField(decimal_places=2, max_digits=7, null=True)),
+                ('p90_price', models.DecimalField(decimal_places=2, max_digits=7, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('dish_type', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='price_stats', to='kitchen.dishtype')),
+            ],
+            options={
+                'verbose_name_plural': 'dish type price stats',
+                'ordering': ('dish_type__name',),
+            },
+        ),
+    ]
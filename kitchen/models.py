@@ -47,3 +47,46 @@ class Dish(models.Model):
 
     def __str__(self):
         return f"{self.name} (price: {self.price}, dish_type: {self.dish_type.name})"
+
+
+class DishTypePriceStats(models.Model):
+    # Precomputed by kitchen.analytics, refreshed from Dish signals
+    dish_type = models.OneToOneField(
+        DishType,
+        on_delete=models.CASCADE,
+        related_name="price_stats"
+    )
+    dish_count = models.PositiveIntegerField(default=0)
+    min_price = models.DecimalField(max_digits=7, decimal_places=2, null=True)
+    max_price = models.DecimalField(max_digits=7, decimal_places=2, null=True)
+    avg_price = models.DecimalField(max_digits=7, decimal_places=2, null=True)
+    p25_price = models.DecimalField(max_digits=7, decimal_places=2, null=True)
+    median_price = models.DecimalField(max_digits=7, decimal_places=2, null=True)
+    p75_price = models.DecimalField(max_digits=7, decimal_places=2, null=True)
+    p90_price = models.DecimalField(max_digits=7, decimal_places=2, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("dish_type__name", )
+        verbose_name_plural = "dish type price stats"
+
+    def __str__(self):
+        return f"{self.dish_type.name} (dishes: {self.dish_count})"
+
+
+class CookWorkloadStats(models.Model):
+    # Precomputed by kitchen.analytics, refreshed from Cook and Dish.cooks signals
+    years_of_experience = models.PositiveSmallIntegerField(unique=True)
+    cook_count = models.PositiveIntegerField(default=0)
+    dish_count = models.PositiveIntegerField(default=0)
+    min_dishes = models.PositiveIntegerField(default=0)
+    max_dishes = models.PositiveIntegerField(default=0)
+    avg_dishes = models.DecimalField(max_digits=7, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("years_of_experience", )
+        verbose_name_plural = "cook workload stats"
+
+    def __str__(self):
+        return f"{self.years_of_experience} years (cooks: {self.cook_count})"
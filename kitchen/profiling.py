@@ -0,0 +1,115 @@
+import sys
+import threading
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime
+from itertools import count
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import Resolver404, resolve
+
+
+class StackSampler:
+    """Samples the call stack of the current thread from a background thread."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def collapsed(self):
+        # One "frame;frame;frame count" line per stack, as read by flamegraph.pl / speedscope
+        return "".join(
+            f"{stack} {samples}\n" for stack, samples in self.stacks.most_common()
+        )
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a request when a staff user asks for it with ``?profile`` or the
+    ``X-Profile`` header, and 1 in PROFILING_SAMPLE_RATE requests per URL name
+    of the kitchen app. Profiles are kept in PROFILING_DIR as collapsed-stack
+    files, only the newest PROFILING_MAX_FILES are kept.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self.directory = Path(settings.PROFILING_DIR)
+        self.max_files = settings.PROFILING_MAX_FILES
+        self.interval = settings.PROFILING_INTERVAL
+        self.counters = defaultdict(count)
+        self.lock = threading.Lock()
+
+    def __call__(self, request):
+        url_name, staff_requested = self.profiled_url_name(request)
+        if url_name is None:
+            return self.get_response(request)
+
+        with StackSampler(self.interval) as sampler:
+            response = self.get_response(request)
+        filename = self.save(url_name, sampler.collapsed())
+        # Sampled requests are profiled silently, only staff asking see the file name
+        if staff_requested:
+            response["X-Profile"] = filename
+        return response
+
+    def profiled_url_name(self, request):
+        """Return the URL name to profile the request under, or None, and whether staff asked for it."""
+        requested = "profile" in request.GET or "HTTP_X_PROFILE" in request.META
+        if not requested and not self.sample_rate:
+            return None, False
+
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None, False
+        url_name = match.url_name or "unnamed"
+
+        if requested and request.user.is_staff:
+            return url_name, True
+        if (
+            self.sample_rate
+            and match.app_name == "kitchen"
+            and next(self.counters[url_name]) % self.sample_rate == 0
+        ):
+            return url_name, False
+        return None, False
+
+    def save(self, url_name, collapsed):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        filename = f"{timestamp}-{url_name}-{uuid.uuid4().hex[:8]}.folded"
+        (self.directory / filename).write_text(collapsed)
+
+        with self.lock:
+            # File names start with a timestamp, so they sort oldest first
+            profiles = sorted(self.directory.glob("*.folded"))
+            for path in profiles[:-self.max_files]:
+                path.unlink(missing_ok=True)
+        return filename
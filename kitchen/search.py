@@ -0,0 +1,108 @@
+import hashlib
+import uuid
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.core.cache import caches
+
+SEARCH_CACHE_KEY = "kitchen:search"
+
+# A-Z only, the letters SQLite LIKE compares without case
+ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def normalize_query(query):
+    """
+    Cache key form of a query. Only ASCII text is lowercased, SQLite LIKE
+    ignores the case of ASCII letters only, so other text keeps its case.
+    """
+    query = query.strip()
+    return query.lower() if query.isascii() else query
+
+
+def _version_key(model):
+    return f"{SEARCH_CACHE_KEY}:{model._meta.label_lower}:version"
+
+
+def _version(model):
+    # Versions live in a cache shared by all workers, so a save in one
+    # worker makes every worker miss its cached results of the model
+    versions = caches["search_versions"]
+    version_key = _version_key(model)
+    version = versions.get(version_key)
+    if version is None:
+        versions.add(version_key, uuid.uuid4().hex, None)
+        version = versions.get(version_key)
+    return version
+
+
+def _result_key(model, field, version, query):
+    digest = hashlib.md5(normalize_query(query).encode()).hexdigest()
+    return f"{SEARCH_CACHE_KEY}:{model._meta.label_lower}:{field}:{version}:{digest}"
+
+
+def invalidate_search(model):
+    """Drop every cached search of the model by moving to a new key version."""
+    # A fresh token never comes back to a version with cached results
+    caches["search_versions"].set(_version_key(model), uuid.uuid4().hex, None)
+
+
+class SearchResults(Sequence):
+    """
+    Ordered list of matching ids that loads only the sliced rows, so the
+    paginator counts with len() instead of a COUNT query.
+    """
+
+    def __init__(self, queryset, ids):
+        self.queryset = queryset
+        self.model = queryset.model
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1 or None][0]
+        ids = self.ids[index]
+        objects = self.queryset.in_bulk(ids)
+        return [objects[pk] for pk in ids if pk in objects]
+
+
+def cached_search(queryset, field, query):
+    """
+    Filter ``queryset`` by ``field__icontains=query`` through cached
+    (pk, value) lists. A cached shorter prefix of an ASCII query holds a
+    superset of the new results, so refining a typed word filters it in
+    Python without a query. Other misses are narrowed to the superset ids.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    results = caches["search_results"]
+    model = queryset.model
+    version = _version(model)
+    key = _result_key(model, field, version, query)
+    rows = results.get(key)
+    if rows is None:
+        prefixes = {
+            _result_key(model, field, version, query[:length]): length
+            for length in range(1, len(query))
+            if query[:length].strip()
+        }
+        cached = results.get_many(prefixes)
+        superset = cached[max(cached, key=prefixes.get)] if cached else None
+        if superset is not None and query.isascii():
+            needle = query.translate(ASCII_LOWER)
+            rows = [
+                (pk, value) for pk, value in superset
+                if needle in value.translate(ASCII_LOWER)
+            ]
+        else:
+            candidates = queryset.filter(**{f"{field}__icontains": query})
+            if superset is not None and len(superset) <= settings.SEARCH_SUPERSET_LIMIT:
+                candidates = candidates.filter(pk__in=[pk for pk, _ in superset])
+            rows = list(candidates.values_list("pk", field))
+        results.set(key, rows, settings.SEARCH_CACHE_TIMEOUT)
+    return SearchResults(queryset, [pk for pk, _ in rows])
@@ -0,0 +1,118 @@
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+
+from kitchen.analytics import refresh_cook_workload, refresh_price_stats
+from kitchen.models import Dish, DishType
+from kitchen.search import invalidate_search
+
+# Sent once per kitchen.assignments.bulk_assign call with the sets of added
+# and removed (cook_id, dish_id) pairs, in addition to its per dish m2m_changed
+dish_cooks_bulk_changed = Signal()
+
+
+def _on_commit(refresh, keys):
+    transaction.on_commit(partial(refresh, {key for key in keys if key is not None}))
+
+
+@receiver(pre_save, sender=Dish)
+def remember_dish_type(sender, instance, **kwargs):
+    instance._old_dish_type_id = (
+        Dish.objects.filter(pk=instance.pk).values_list("dish_type_id", flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Dish)
+def dish_saved(sender, instance, **kwargs):
+    _on_commit(refresh_price_stats, [instance.dish_type_id, instance._old_dish_type_id])
+
+
+@receiver(pre_delete, sender=Dish)
+def remember_cooks_experience(sender, instance, **kwargs):
+    # The Dish.cooks rows are deleted with the dish without m2m_changed
+    instance._cooks_years_of_experience = set(
+        instance.cooks.values_list("years_of_experience", flat=True)
+    )
+
+
+@receiver(post_delete, sender=Dish)
+def dish_deleted(sender, instance, **kwargs):
+    _on_commit(refresh_price_stats, [instance.dish_type_id])
+    if instance._cooks_years_of_experience:
+        _on_commit(refresh_cook_workload, instance._cooks_years_of_experience)
+
+
+@receiver(post_save, sender=DishType)
+def dish_type_saved(sender, instance, created, **kwargs):
+    if created:
+        _on_commit(refresh_price_stats, [instance.pk])
+
+
+def _updates_experience(update_fields):
+    # Logins save the cook with update_fields=["last_login"]
+    return update_fields is None or "years_of_experience" in update_fields
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def remember_experience(sender, instance, update_fields=None, **kwargs):
+    instance._old_years_of_experience = (
+        sender.objects.filter(pk=instance.pk).values_list("years_of_experience", flat=True).first()
+        if instance.pk and _updates_experience(update_fields) else None
+    )
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def cook_saved(sender, instance, update_fields=None, **kwargs):
+    if _updates_experience(update_fields):
+        _on_commit(
+            refresh_cook_workload,
+            [instance.years_of_experience, instance._old_years_of_experience],
+        )
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def cook_deleted(sender, instance, **kwargs):
+    _on_commit(refresh_cook_workload, [instance.years_of_experience])
+
+
+@receiver(m2m_changed, sender=Dish.cooks.through)
+def dish_cooks_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    # bulk_assign refreshes once for the whole call through dish_cooks_bulk_changed
+    if action not in ("post_add", "post_remove", "post_clear") or kwargs.get("bulk_assign"):
+        return
+    if reverse:
+        # cook.dishes was changed
+        _on_commit(refresh_cook_workload, [instance.years_of_experience])
+    elif action == "post_clear":
+        transaction.on_commit(refresh_cook_workload)
+    else:
+        _on_commit(
+            refresh_cook_workload,
+            model.objects.filter(pk__in=pk_set).values_list("years_of_experience", flat=True),
+        )
+
+
+@receiver(dish_cooks_bulk_changed)
+def dish_cooks_bulk_assigned(sender, added, removed, **kwargs):
+    cook_ids = {cook_id for cook_id, _ in added | removed}
+    _on_commit(
+        refresh_cook_workload,
+        get_user_model().objects.filter(pk__in=cook_ids).values_list("years_of_experience", flat=True),
+    )
+
+
+@receiver([post_save, post_delete], sender=Dish)
+@receiver([post_save, post_delete], sender=DishType)
+def searchable_changed(sender, **kwargs):
+    invalidate_search(sender)
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def cook_search_changed(sender, update_fields=None, **kwargs):
+    if update_fields is None or "username" in update_fields:
+        invalidate_search(sender)
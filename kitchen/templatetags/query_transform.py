@@ -12,3 +12,17 @@ def query_transform(request, **kwargs):
         else:
             updated.pop(key, 0)
     return updated.urlencode()
+
+
+@register.simple_tag
+def query_base(request, param="page"):
+    """
+    Encode the request query without ``param`` once per render, links are
+    then built as "?{{ base }}page={{ n }}". A one-off ``profile`` request
+    (see kitchen/profiling.py) is not carried over to other pages.
+    """
+    query = request.GET.copy()
+    query.pop(param, None)
+    query.pop("profile", None)
+    encoded = query.urlencode()
+    return f"{encoded}&" if encoded else ""
@@ -1,3 +1,327 @@
-from django.test import TestCase
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.core.paginator import Paginator
+from django.db.models.signals import m2m_changed
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from kitchen.analytics import is_rate_limited, price_stats
+from kitchen.assignments import bulk_assign
+from kitchen.models import CookWorkloadStats, Dish, DishType
+from kitchen.search import SearchResults, _version_key, cached_search
+from kitchen.signals import dish_cooks_bulk_changed
+
+LOCMEM_CACHES = {
+    alias: {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": alias,
+    }
+    for alias in ("default", "search_versions", "search_results")
+}
+
+
+class PriceStatsTests(TestCase):
+    def test_empty_prices(self):
+        self.assertEqual(price_stats([]), {"dish_count": 0})
+
+    def test_single_price_is_every_percentile(self):
+        stats = price_stats([Decimal("4.50")])
+        self.assertEqual(stats["dish_count"], 1)
+        for field in ("min_price", "max_price", "avg_price", "p25_price", "median_price", "p90_price"):
+            self.assertEqual(stats[field], Decimal("4.50"))
+
+    def test_percentiles_are_interpolated(self):
+        prices = [Decimal(price) for price in ("20", "5", "11", "7", "9")]
+        stats = price_stats(prices)
+        self.assertEqual(stats["min_price"], Decimal("5"))
+        self.assertEqual(stats["max_price"], Decimal("20"))
+        self.assertEqual(stats["avg_price"], Decimal("10.40"))
+        self.assertEqual(stats["p25_price"], Decimal("7.00"))
+        self.assertEqual(stats["median_price"], Decimal("9.00"))
+        self.assertEqual(stats["p75_price"], Decimal("11.00"))
+        self.assertEqual(stats["p90_price"], Decimal("16.40"))
+
+
+@override_settings(CACHES=LOCMEM_CACHES, ANALYTICS_RATE_LIMIT=2)
+class AnalyticsViewTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.user = get_user_model().objects.create_user(
+            username="manager", password="test12345", is_staff=True
+        )
+        self.client.force_login(self.user)
+
+    @mock.patch("kitchen.analytics.time")
+    def test_rate_limit_window_resets(self, time):
+        time.return_value = 120
+        self.assertFalse(is_rate_limited(self.user))
+        self.assertFalse(is_rate_limited(self.user))
+        self.assertTrue(is_rate_limited(self.user))
+        self.assertTrue(is_rate_limited(self.user))
+
+        time.return_value = 180
+        self.assertFalse(is_rate_limited(self.user))
+
+    def test_json_is_rate_limited(self):
+        url = reverse("kitchen:analytics-json")
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 429)
+
+    def test_zero_price_is_shown(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            dish_type = DishType.objects.create(name="Free")
+            DishType.objects.create(name="Empty")
+            Dish.objects.create(
+                name="Water", description="Tap", price=Decimal("0.00"), dish_type=dish_type
+            )
+        response = self.client.get(reverse("kitchen:analytics"))
+        self.assertContains(response, "<td>0.00</td>", count=7)
+        self.assertContains(response, "<td>-</td>", count=7)
+
+    def test_non_staff_is_forbidden(self):
+        self.user.is_staff = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse("kitchen:analytics")).status_code, 403)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CachedSearchTests(TestCase):
+    def setUp(self):
+        for alias in LOCMEM_CACHES:
+            caches[alias].clear()
+        self.dish_type = DishType.objects.create(name="Soup")
+        for name in ("Borsch", "Soup of the day", "Straße soup", "Salad"):
+            self.create_dish(name)
+
+    def create_dish(self, name):
+        return Dish.objects.create(
+            name=name, description="", price=Decimal("5.00"), dish_type=self.dish_type
+        )
+
+    def search(self, query):
+        return [dish.name for dish in cached_search(Dish.objects.all(), "name", query)]
+
+    def test_matches_like_icontains(self):
+        for query in ("SOUP", "soup", "Straße", "straße", "o", " of the "):
+            self.assertEqual(
+                self.search(query),
+                [dish.name for dish in Dish.objects.filter(name__icontains=query.strip())],
+            )
+
+    def test_empty_query_returns_queryset(self):
+        queryset = Dish.objects.all()
+        self.assertIs(cached_search(queryset, "name", "  "), queryset)
+
+    def test_cached_query_needs_no_id_query(self):
+        self.search("soup")
+        with self.assertNumQueries(0):
+            cached_search(Dish.objects.all(), "name", "SOUP ")
+
+    def test_prefix_refinement_needs_no_id_query(self):
+        self.assertEqual(self.search("s"), ["Borsch", "Salad", "Soup of the day", "Straße soup"])
+        with self.assertNumQueries(0):
+            results = cached_search(Dish.objects.all(), "name", "SoU")
+        self.assertEqual([dish.name for dish in results], ["Soup of the day", "Straße soup"])
+
+    def test_non_ascii_refinement_filters_in_database(self):
+        self.search("str")
+        self.assertEqual(self.search("straß"), ["Straße soup"])
+        self.assertEqual(self.search("STRASS"), [])
+
+    def test_save_invalidates_cached_results(self):
+        self.assertEqual(self.search("bo"), ["Borsch"])
+        self.create_dish("Bouillabaisse")
+        self.assertEqual(self.search("bo"), ["Borsch", "Bouillabaisse"])
+
+    def test_lost_version_does_not_revive_old_results(self):
+        self.assertEqual(self.search("bo"), ["Borsch"])
+        caches["search_versions"].delete(_version_key(Dish))
+        self.create_dish("Bouillabaisse")
+        self.assertEqual(self.search("bo"), ["Borsch", "Bouillabaisse"])
+
+    def test_login_does_not_invalidate_cook_search(self):
+        cook = get_user_model().objects.create_user(username="chef", password="test12345")
+        cached_search(get_user_model().objects.all(), "username", "che")
+        version = caches["search_versions"].get(_version_key(get_user_model()))
+        self.client.force_login(cook)
+        self.assertEqual(caches["search_versions"].get(_version_key(get_user_model())), version)
+
+
+class SearchResultsTests(TestCase):
+    def setUp(self):
+        dish_type = DishType.objects.create(name="Main")
+        self.dishes = [
+            Dish.objects.create(
+                name=f"Dish {number}", description="", price=Decimal("1.00"), dish_type=dish_type
+            )
+            for number in range(5)
+        ]
+        ids = [dish.pk for dish in reversed(self.dishes)]
+        self.results = SearchResults(Dish.objects.all(), ids)
+
+    def test_paginator_counts_without_query(self):
+        with self.assertNumQueries(0):
+            paginator = Paginator(self.results, 2)
+            self.assertEqual(paginator.count, 5)
+            self.assertEqual(paginator.num_pages, 3)
+
+    def test_page_loads_rows_in_id_order(self):
+        with self.assertNumQueries(1):
+            page = list(Paginator(self.results, 2).page(2).object_list)
+        self.assertEqual(page, [self.dishes[2], self.dishes[1]])
+
+    def test_index(self):
+        self.assertEqual(self.results[0], self.dishes[4])
+        self.assertEqual(self.results[-1], self.dishes[0])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class DishListSearchTests(TestCase):
+    def setUp(self):
+        for alias in LOCMEM_CACHES:
+            caches[alias].clear()
+        dish_type = DishType.objects.create(name="Soup")
+        for number in range(7):
+            Dish.objects.create(
+                name=f"Soup {number}", description="", price=Decimal("1.00"), dish_type=dish_type
+            )
+        self.client.force_login(
+            get_user_model().objects.create_user(username="cook", password="test12345")
+        )
+
+    def test_search_is_paginated(self):
+        response = self.client.get(reverse("kitchen:dish-list"), {"name": "soup", "page": 2})
+        self.assertEqual(response.context["paginator"].count, 7)
+        self.assertEqual(
+            [dish.name for dish in response.context["dish_list"]], ["Soup 5", "Soup 6"]
+        )
+        self.assertContains(response, 'href="?name=soup&amp;page=1"')
+
+    def test_pagination_links_drop_profile(self):
+        response = self.client.get(reverse("kitchen:dish-list"), {"name": "soup", "profile": ""})
+        self.assertNotContains(response, "profile")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class BulkAssignTests(TestCase):
+    def setUp(self):
+        dish_type = DishType.objects.create(name="Main")
+        self.cooks = [
+            get_user_model().objects.create_user(
+                username=f"cook{number}", password="test12345", years_of_experience=number
+            )
+            for number in range(3)
+        ]
+        self.dishes = [
+            Dish.objects.create(
+                name=f"Dish {number}", description="", price=Decimal("1.00"), dish_type=dish_type
+            )
+            for number in range(4)
+        ]
+        self.dishes[0].cooks.set([self.cooks[0], self.cooks[1]])
+        self.dishes[1].cooks.set([self.cooks[0]])
+        self.dishes[3].cooks.set([self.cooks[2]])
+
+    def assignments(self):
+        return set(Dish.cooks.through.objects.values_list("cook_id", "dish_id"))
+
+    def pair(self, cook, dish):
+        return self.cooks[cook].pk, self.dishes[dish].pk
+
+    def test_applies_the_diff(self):
+        result = bulk_assign([self.pair(1, 0), self.pair(2, 0), self.pair(1, 2)])
+        self.assertEqual(result, {"added": 2, "removed": 1})
+        self.assertEqual(
+            self.assignments(),
+            {self.pair(1, 0), self.pair(2, 0), self.pair(1, 2), self.pair(0, 1), self.pair(2, 3)},
+        )
+
+    def test_dish_ids_clear_dishes_without_pairs(self):
+        result = bulk_assign([], dish_ids=[self.dishes[0].pk, self.dishes[3].pk])
+        self.assertEqual(result, {"added": 0, "removed": 3})
+        self.assertEqual(self.assignments(), {self.pair(0, 1)})
+
+    def test_unknown_ids_change_nothing(self):
+        before = self.assignments()
+        with self.assertRaisesMessage(ValueError, "Unknown cook ids: 999"):
+            bulk_assign([(999, self.dishes[0].pk)])
+        with self.assertRaisesMessage(ValueError, "Unknown dish ids: 998"):
+            bulk_assign([(self.cooks[0].pk, 998)])
+        self.assertEqual(self.assignments(), before)
+
+    def test_unchanged_target_is_a_no_op(self):
+        self.assertEqual(
+            bulk_assign([self.pair(0, 0), self.pair(1, 0)]), {"added": 0, "removed": 0}
+        )
+
+    def test_batches_send_m2m_changed_per_dish(self):
+        calls = []
+
+        def receiver(sender, instance, action, pk_set, **kwargs):
+            calls.append((action, instance.pk, pk_set))
+
+        m2m_changed.connect(receiver, sender=Dish.cooks.through)
+        self.addCleanup(m2m_changed.disconnect, receiver, sender=Dish.cooks.through)
+        bulk_assign(
+            [self.pair(2, 0), self.pair(2, 1), self.pair(2, 2)],
+            dish_ids=[self.dishes[3].pk],
+            batch_size=2,
+        )
+
+        self.assertEqual(self.assignments(), {self.pair(2, 0), self.pair(2, 1), self.pair(2, 2)})
+        self.assertEqual(
+            sorted(calls),
+            sorted([
+                ("pre_add", self.dishes[0].pk, {self.cooks[2].pk}),
+                ("post_add", self.dishes[0].pk, {self.cooks[2].pk}),
+                ("pre_remove", self.dishes[0].pk, {self.cooks[0].pk, self.cooks[1].pk}),
+                ("post_remove", self.dishes[0].pk, {self.cooks[0].pk, self.cooks[1].pk}),
+                ("pre_add", self.dishes[1].pk, {self.cooks[2].pk}),
+                ("post_add", self.dishes[1].pk, {self.cooks[2].pk}),
+                ("pre_remove", self.dishes[1].pk, {self.cooks[0].pk}),
+                ("post_remove", self.dishes[1].pk, {self.cooks[0].pk}),
+                ("pre_add", self.dishes[2].pk, {self.cooks[2].pk}),
+                ("post_add", self.dishes[2].pk, {self.cooks[2].pk}),
+                ("pre_remove", self.dishes[3].pk, {self.cooks[2].pk}),
+                ("post_remove", self.dishes[3].pk, {self.cooks[2].pk}),
+            ]),
+        )
+
+    def test_bulk_signal_and_workload_refresh_once(self):
+        bulk_calls = []
+
+        def receiver(sender, added, removed, **kwargs):
+            bulk_calls.append((added, removed))
+
+        dish_cooks_bulk_changed.connect(receiver)
+        self.addCleanup(dish_cooks_bulk_changed.disconnect, receiver)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            bulk_assign([self.pair(2, 0), self.pair(2, 1), self.pair(2, 2)], batch_size=1)
+
+        self.assertEqual(len(bulk_calls), 1)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(
+            list(CookWorkloadStats.objects.values_list("years_of_experience", "dish_count")),
+            [(0, 0), (1, 0), (2, 4)],
+        )
+
+    def test_command(self):
+        csv_file = mock.mock_open(
+            read_data=f"cook_id,dish_id\n{self.cooks[2].pk},{self.dishes[2].pk}\n"
+        )
+        out = StringIO()
+        with mock.patch("kitchen.management.commands.assign_cooks.open", csv_file, create=True):
+            call_command("assign_cooks", "shift.csv", stdout=out)
+        self.assertIn("Added 1 and removed 0 assignments", out.getvalue())
+        csv_file.assert_called_once_with("shift.csv", newline="")
+        self.assertIn(self.pair(2, 2), self.assignments())
+
+    def test_command_missing_file(self):
+        with self.assertRaisesMessage(CommandError, "Cannot read missing.csv"):
+            call_command("assign_cooks", "missing.csv")
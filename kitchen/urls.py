@@ -16,6 +16,9 @@ from kitchen.views import (
     DishUpdateView,
     DishDeleteView,
     DishAssignView,
+    DishBulkAssignView,
+    AnalyticsView,
+    AnalyticsJsonView,
 )
 
 
@@ -36,6 +39,9 @@ urlpatterns = [
     path("dishes/<int:pk>/update/", DishUpdateView.as_view(), name="dish-update"),
     path("dishes/<int:pk>/delete/", DishDeleteView.as_view(), name="dish-delete"),
     path("dishes/<int:pk>/assign/", DishAssignView.as_view(), name="dish-assign"),
+    path("dishes/assign/", DishBulkAssignView.as_view(), name="dish-bulk-assign"),
+    path("analytics/", AnalyticsView.as_view(), name="analytics"),
+    path("analytics/json/", AnalyticsJsonView.as_view(), name="analytics-json"),
 ]
 
 app_name = "kitchen"
@@ -1,14 +1,19 @@
+import json
+
 from django.contrib.auth import get_user
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth.mixins import LoginRequiredMixin
-from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect, JsonResponse
 from django.shortcuts import render
 from django.urls import reverse_lazy, reverse
 from django.views import generic, View
 
+from kitchen.analytics import get_analytics, is_rate_limited
+from kitchen.assignments import bulk_assign
 from kitchen.forms import CookCreationForm, CookExperienceUpdateForm, DishForm, CookSearchForm, DishSearchForm, \
     DishTypeSearchForm
 from kitchen.models import DishType, Dish, Cook
+from kitchen.search import cached_search
 
 
 @login_required
@@ -45,7 +50,7 @@ class DishTypeListView(LoginRequiredMixin, generic.ListView):
         queryset = DishType.objects.all()
         form = DishTypeSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(name__icontains=form.cleaned_data["name"])
+            return cached_search(queryset, "name", form.cleaned_data["name"])
         return queryset
 
 
@@ -142,8 +147,8 @@ class CookListView(LoginRequiredMixin, generic.ListView):
         queryset = Cook.objects.all()
         form = CookSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(
-                username__icontains=form.cleaned_data["username"]
+            return cached_search(
+                queryset, "username", form.cleaned_data["username"]
             )
         return queryset
 
@@ -184,7 +189,7 @@ class DishListView(LoginRequiredMixin, generic.ListView):
         queryset = Dish.objects.all().select_related("dish_type")
         form = DishSearchForm(self.request.GET)
         if form.is_valid():
-            return queryset.filter(name__icontains=form.cleaned_data["name"])
+            return cached_search(queryset, "name", form.cleaned_data["name"])
         return queryset
 
 
@@ -220,3 +225,40 @@ class DishAssignView(LoginRequiredMixin, View):
         else:
             cooks.add(user)
         return HttpResponseRedirect(reverse("kitchen:dish-detail", args=[pk]))
+
+
+class StaffRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
+    def test_func(self):
+        return self.request.user.is_staff
+
+
+class DishBulkAssignView(StaffRequiredMixin, View):
+    # POST {"pairs": [[cook_id, dish_id], ...], "dishes": [dish_id, ...]}
+    def post(self, request):
+        try:
+            data = json.loads(request.body)
+            result = bulk_assign(data["pairs"], data.get("dishes"))
+        except (KeyError, TypeError, ValueError) as error:
+            return JsonResponse({"error": str(error)}, status=400)
+        return JsonResponse(result)
+
+
+class AnalyticsView(StaffRequiredMixin, generic.TemplateView):
+    template_name = "kitchen/analytics.html"
+
+    def get(self, request, *args, **kwargs):
+        if is_rate_limited(request.user):
+            return HttpResponse("Too many requests", status=429)
+        return super().get(request, *args, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super(AnalyticsView, self).get_context_data(**kwargs)
+        context.update(get_analytics())
+        return context
+
+
+class AnalyticsJsonView(StaffRequiredMixin, View):
+    def get(self, request):
+        if is_rate_limited(request.user):
+            return JsonResponse({"error": "Too many requests"}, status=429)
+        return JsonResponse(get_analytics())
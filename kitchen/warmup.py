@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from django.template import TemplateSyntaxError, engines
+from django.urls import URLResolver, get_resolver
+
+
+def warmup_templates():
+    """
+    Compile every template of the project templates directories so the
+    cached loader serves them from memory on the first request.
+    Returns compiled template names and {name: error} of broken templates.
+    """
+    engine = engines["django"].engine
+    compiled, errors = [], {}
+    for directory in engine.dirs:
+        directory = Path(directory)
+        for path in sorted(directory.rglob("*.html")):
+            name = path.relative_to(directory).as_posix()
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as error:
+                errors[name] = error
+            else:
+                compiled.append(name)
+    return compiled, errors
+
+
+def warmup_urls(resolver=None):
+    """Populate reverse lookups of the URLconf and its includes, returns the number of patterns."""
+    resolver = resolver or get_resolver()
+    # Accessing reverse_dict builds the lookup tables used by reverse() and {% url %}
+    resolver.reverse_dict
+    total = 0
+    for pattern in resolver.url_patterns:
+        if isinstance(pattern, URLResolver):
+            total += warmup_urls(pattern)
+        else:
+            total += 1
+    return total
+
+
+def warmup():
+    compiled, errors = warmup_templates()
+    return {
+        "templates": len(compiled),
+        "template_errors": errors,
+        "urls": warmup_urls(),
+    }
@@ -57,6 +57,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_htmx.middleware.HtmxMiddleware",
+    "kitchen.profiling.ProfilingMiddleware",
 ]
 
 ROOT_URLCONF = "restaurant_kitchen_service.urls"
@@ -150,6 +151,66 @@ LOGIN_REDIRECT_URL = "/"
 
 CRISPY_TEMPLATE_PACK = "bootstrap4"
 
+# Request profiling, see kitchen/profiling.py
+# Staff users profile a request with ?profile or the X-Profile header,
+# DJANGO_PROFILING_SAMPLE_RATE=N also profiles 1 in N requests per URL name
+
+PROFILING_ENABLED = os.environ.get("DJANGO_PROFILING", "") == "True"
+
+PROFILING_SAMPLE_RATE = int(os.environ.get("DJANGO_PROFILING_SAMPLE_RATE", 0))
+
+PROFILING_DIR = BASE_DIR / "profiles"
+
+PROFILING_MAX_FILES = 100
+
+PROFILING_INTERVAL = 0.005
+
+# Compile templates and resolve URLs when a worker loads wsgi.py,
+# see kitchen/warmup.py and "python manage.py warmup --import-profile"
+
+WARMUP_ON_STARTUP = os.environ.get("DJANGO_WARMUP", "") != "False"
+
+# Menu pricing and cook workload analytics, see kitchen/analytics.py
+
+ANALYTICS_CACHE_TIMEOUT = 60
+
+# Requests per minute per staff user
+
+ANALYTICS_RATE_LIMIT = 30
+
+# "default" and "search_versions" are shared by all workers of a host, so
+# saves invalidate cached analytics and searches everywhere. Use a network
+# cache for them when running several hosts. "search_versions" only holds
+# one key per model and must never cull it, search results themselves are
+# kept per worker in "search_results" under the shared version
+
+CACHE_DIR = Path(os.environ.get("DJANGO_CACHE_DIR", BASE_DIR / "cache"))
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": CACHE_DIR / "default",
+    },
+    "search_versions": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": CACHE_DIR / "search_versions",
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 1_000_000},
+    },
+    "search_results": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "OPTIONS": {"MAX_ENTRIES": 10_000},
+    },
+}
+
+# Cached id lists of list page searches, see kitchen/search.py
+
+SEARCH_CACHE_TIMEOUT = 300
+
+# Largest cached result used to narrow a longer non-ASCII query in SQL
+
+SEARCH_SUPERSET_LIMIT = 500
+
 # CSRF_COOKIE_SECURE = True
 #
 # SESSION_COOKIE_SECURE = True